@@ -1,15 +1,31 @@
 import os
+import argparse
 import json
 import csv
+import heapq
+import multiprocessing
 import re
+import stat
+import sys
+import tempfile
+from array import array
+import time
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
 # !------- Helper utilities by Ifty Zubaer -------!
 ROOT = os.path.dirname(os.path.abspath(__file__))
 DATASET = os.path.join(ROOT, "dataset")
 MOOSIFIED_DIR = os.path.join(ROOT, "moosified")
 ARTISTS_DATA_CSV = os.path.join(DATASET, "artist-data.csv")
 INVERTED_INDEX_FILE = os.path.join(DATASET, "inverted_index.json")
+GENRE_ANALYTICS_FILE = os.path.join(DATASET, "genre_analytics.json")
 CONCERTS_CSV = os.path.join(DATASET, "concerts", "concerts.csv")
 WEATHER_CSV = os.path.join(DATASET, "weather", "weather.csv")
 ARTISTS_DIR = os.path.join(DATASET, "artists")
@@ -21,6 +37,8 @@ JSON_EXTENTION = ".json"
 NO_ARTIST_MESSAGE = "No artists found in the database."
 INPUT_ARTIST_NAME_MESSAGE = "Please input the name of one of the following artists: "
 INVALID_CHOICE_MESSAGE = "Invalid choice."
+OUTPUT_BUFFER_LINES = 256
+LISTING_OPTIONS = {"page_size": 0, "after": None}
 
 def load_json(file_path):
     try:
@@ -33,6 +51,114 @@ def load_json(file_path):
         print(f"Error: Invalid JSON in file - {file_path}")
         return None
 
+@contextmanager
+def file_lock(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.lock", "a+") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def atomic_write(path, newline=None):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    file_descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+
+    # Readers only ever see the old file or the complete new one, never a partial write.
+    try:
+        with open(file_descriptor, "w", encoding="utf-8", newline=newline) as file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        # mkstemp creates the file as 0600, so keep the target's permissions or the usual umask default.
+        os.chmod(temp_path, get_file_mode(path))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def get_file_mode(path):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_lines(lines):
+    buffer = []
+
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= OUTPUT_BUFFER_LINES:
+            sys.stdout.write("\n".join(buffer) + "\n")
+            buffer = []
+
+    if buffer:
+        sys.stdout.write("\n".join(buffer) + "\n")
+    sys.stdout.flush()
+
+def list_json_files_after(directory, after=None):
+    files = sorted(file for file in os.listdir(directory) if file.endswith(JSON_EXTENTION))
+    return [file for file in files if after is None or file > after]
+
+def enumerate_after(items, after=None):
+    start = int(after) if after and after.isdigit() else 0
+
+    for position in range(start, len(items)):
+        yield str(position + 1), items[position]
+
+def get_listing_after(listing):
+    after = LISTING_OPTIONS["after"]
+    prefix = f"{listing}:"
+
+    # Cursors are tagged with their listing, so a cursor from another listing is ignored.
+    if after and after.startswith(prefix):
+        return after[len(prefix):]
+    return None
+
+def get_page(listing, stream_function, *args):
+    page_size = LISTING_OPTIONS["page_size"]
+    page = []
+    has_more = False
+
+    # Stops reading the stream as soon as the page is full and one more entry proves there is a next page.
+    for cursor, item in stream_function(*args, get_listing_after(listing)):
+        if page_size and len(page) == page_size:
+            has_more = True
+            break
+        page.append((cursor, item))
+
+    next_cursor = f"{listing}:{page[-1][0]}" if has_more else None
+    return page, next_cursor
+
+def print_next_cursor(next_cursor):
+    if next_cursor:
+        print(f"More results available. Continue with --after {next_cursor}")
+
+def print_listing_end(listing, empty_message=None):
+    if get_listing_after(listing) is not None:
+        print(f"No more results after --after {LISTING_OPTIONS['after']}.")
+    elif empty_message:
+        print(empty_message)
+
 # !------- Task 0.1: Main Menu by Ifty Zubaer -------!
 def print_menu():
     print("1. Get All Artists")
@@ -84,33 +210,38 @@ def main():
             print("Error - Invalid option. Please input a number between 1 and 10.")
 
 # !------- Task 1: Get All Artists by Ifty -------!
-def read_all_artists():
+def iter_artists(after=None):
     try:
-        files = sorted(os.listdir(ARTISTS_DIR))
+        files = list_json_files_after(ARTISTS_DIR, after)
     except FileNotFoundError:
         print(f"Error: Artists directory not found - {ARTISTS_DIR}")
-        return []
+        return
     
-    artists = []
     for file in files:
-        if file.endswith(JSON_EXTENTION):
-            artist_data = load_json(os.path.join(ARTISTS_DIR, file))
-            if artist_data:
-                artists.append(artist_data.get("name", ""))
-    return artists
-
-def print_artists(artists):
-    if artists:
-        for name in artists:
-            print(f"- {name}")
+        artist_data = load_json(os.path.join(ARTISTS_DIR, file))
+        if artist_data:
+            yield file, artist_data.get("name", "")
+
+def read_all_artists():
+    return [name for _, name in iter_artists()]
+
+def print_artists(listing, stream_function, *args):
+    page, next_cursor = get_page(listing, stream_function, *args)
+
+    if page:
+        write_lines(f"- {name}" for _, name in page)
+        print_next_cursor(next_cursor)
     else:
-        print(NO_ARTIST_MESSAGE)
+        print_listing_end(listing, NO_ARTIST_MESSAGE)
 
 def get_all_artists():
-    artists = read_all_artists()
-    if artists:
+    page, next_cursor = get_page("artists", iter_artists)
+    if page:
         print("\nArtists found in the database:")
-        print_artists(artists)
+        write_lines(f"- {name}" for _, name in page)
+        print_next_cursor(next_cursor)
+    else:
+        print_listing_end("artists")
 
 # !------- Task 2: Get All Albums By An Artist by Ifty -------!
 def find_artist_by_name(name):
@@ -165,9 +296,7 @@ def format_date(date_str, precision):
     return f"{month_name} {ordinal(day)} {year}"
 
 def get_albums_by_artist():
-    artists = read_all_artists()
-    
-    print_artists(artists)
+    print_artists("artists", iter_artists)
     artist_name = input(INPUT_ARTIST_NAME_MESSAGE).strip()
     artist_file, artist_data = find_artist_by_name(artist_name)
     
@@ -214,9 +343,7 @@ def print_tracks(tracks, artist_name):
         print(f"- \"{name}\" has a popularity score of {popularity}. {message}")
 
 def get_top_tracks_by_artist():
-    artists = read_all_artists()
-
-    print_artists(artists)
+    print_artists("artists", iter_artists)
 
     artist_name = input(INPUT_ARTIST_NAME_MESSAGE).strip()
     artist_file, artist_data = find_artist_by_name(artist_name)
@@ -252,8 +379,7 @@ def read_artists_data_csv():
 
 def write_artists_data_csv(rows):
     try:
-        os.makedirs(os.path.dirname(ARTISTS_DATA_CSV), exist_ok=True)
-        with open(ARTISTS_DATA_CSV, "w", encoding="utf-8", newline="") as file:
+        with atomic_write(ARTISTS_DATA_CSV, newline="") as file:
             field_names = ["artist_id", "artist_name", "number_of_albums", "top_track_1", "top_track_2", "genres"]
             writer = csv.DictWriter(file, fieldnames = field_names)
             writer.writeheader()
@@ -308,8 +434,7 @@ def update_or_append_row(rows, artist_id, new_row):
     return False
 
 def export_artist_data():   
-    artists = read_all_artists()
-    print_artists(artists)
+    print_artists("artists", iter_artists)
     artist_name_input = input(INPUT_ARTIST_NAME_MESSAGE).strip()
     
     artist_file, artist_data = find_artist_by_name(artist_name_input)
@@ -318,10 +443,10 @@ def export_artist_data():
         artist_id = artist_data.get("id")
         
         new_row = create_artist_row(artist_data, artist_id)
-        rows = read_artists_data_csv()
-        was_updated = update_or_append_row(rows, artist_id, new_row)
-        
-        write_artists_data_csv(rows)
+        with file_lock(ARTISTS_DATA_CSV):
+            rows = read_artists_data_csv()
+            was_updated = update_or_append_row(rows, artist_id, new_row)
+            write_artists_data_csv(rows)
         
         print(f"Exporting \"{artist_name}\" data to CSV file...")
         if was_updated:
@@ -376,10 +501,14 @@ def get_released_albums_by_year():
 
         if matching_albums:
             sort_albums_by_name(matching_albums)
+            page, next_cursor = get_page("albums", enumerate_after, matching_albums)
 
-            print(f"Albums released in the year {year_input}:")
-            for name, artist in matching_albums:
-                print(f"- \"{name}\" by {artist}.")
+            if page:
+                print(f"Albums released in the year {year_input}:")
+                write_lines(f"- \"{name}\" by {artist}." for _, (name, artist) in page)
+                print_next_cursor(next_cursor)
+            else:
+                print_listing_end("albums")
         else:
             print(f"No albums were released in the year {year_input}.")
     else:
@@ -394,37 +523,38 @@ def read_all_songs():
         print(f"Error: Songs directory not found - {SONGS_DIR}")
         return []
     
-def get_available_songs():
-    songs = []
+def iter_available_songs(after=None):
+    seen_titles = set()
 
-    files = read_all_songs()
+    # Duplicate titles are only skipped within the streamed range, so earlier pages are never re-read.
+    for file in read_all_songs():
+        if after is not None and file <= after:
+            continue
 
-    for file in files:
         path = os.path.join(SONGS_DIR, file)
-        title = None
-        artist = None
         song_data = load_json(path)
         if song_data:
             title = song_data.get("title", "")
-            artist = song_data.get("artist")
-            songs.append({
-                "title": title,
-                "artist": artist,
-                "path": path,
-                "type": "json"
-            })
-    
-    seen_titles = set()
-    unique_songs = []
+            if title not in seen_titles:
+                seen_titles.add(title)
+                yield file, {
+                    "title": title,
+                    "artist": song_data.get("artist"),
+                    "path": path,
+                    "type": "json"
+                }
+
+def choose_song():
+    page, next_cursor = get_page("songs", iter_available_songs)
+    songs = [song for _, song in page]
 
-    for song in songs:
-        title = song.get("title", "Unknown")
+    if songs:
+        print_song_list(songs)
+        print_next_cursor(next_cursor)
+        return get_valid_song_choice(songs)
 
-        if title not in seen_titles:
-            seen_titles.add(title)
-            unique_songs.append(song)
-    
-    return unique_songs
+    print_listing_end("songs", "No songs available.")
+    return None
 
 def search_songs_by_keyword(entry):
     category = entry.get("type")
@@ -487,7 +617,7 @@ def save_moosified_lyrics(title, moosified_lyrics):
     filename = f"{title} Moosified.txt"
     file_path = os.path.join(MOOSIFIED_DIR, filename)
     
-    with open(file_path, "w", encoding="utf-8") as file:
+    with atomic_write(file_path) as file:
         file.write(moosified_lyrics)
     
     return filename
@@ -511,16 +641,10 @@ def process_moosification(entry):
         print(f"{title} has no lyrics available.")
 
 def moosify_lyrics():
-    songs = get_available_songs()
+    entry = choose_song()
     
-    if songs:
-        print_song_list(songs)
-        entry = get_valid_song_choice(songs)
-        
-        if entry:
-            process_moosification(entry)
-    else:
-        print("No songs available.")
+    if entry:
+        process_moosification(entry)
 
 # !------- Task 7: Calculate Longest Unique Word Sequence In A Song by Ifty -------!
 def process_text_for_analysis(text):
@@ -531,10 +655,8 @@ def process_text_for_analysis(text):
 
 def print_song_list(songs):
     print("Available songs:")
-    for index, song in enumerate(songs, 1):
-        artist = song.get("artist", "Unknown")
-        title = song.get("title")
-        print(f"{index}. {title} by {artist}")
+    write_lines(f"{index}. {song.get('title')} by {song.get('artist', 'Unknown')}"
+                for index, song in enumerate(songs, 1))
 
 def find_longest_unique_sequence(words):
     seen = {}
@@ -567,16 +689,10 @@ def process_song_analysis(entry):
         print("No lyrics found for this song.")
 
 def calculate_longest_unique_sequence():  
-    songs = get_available_songs()
+    entry = choose_song()
     
-    if songs:
-        print_song_list(songs)
-        entry = get_valid_song_choice(songs)
-        
-        if entry:
-            process_song_analysis(entry)
-    else:
-        print("No songs available.")
+    if entry:
+        process_song_analysis(entry)
 
 # !------- Task 8: Weather Forecast For Upcoming Concerts by Salah -------!
 def read_concert_data():
@@ -676,7 +792,7 @@ def predict_weather_for_concerts():
     
     if concerts:
         print("Upcoming artists:")
-        print_artists(artist_list)
+        print_artists("concerts", enumerate_after, artist_list)
         
         artist_input = input(INPUT_ARTIST_NAME_MESSAGE).strip()
         matching_concerts = [c for c in concerts if c["artist"].lower() == artist_input.lower()]
@@ -696,32 +812,126 @@ def predict_weather_for_concerts():
         print("No upcoming concerts found.")
 
 # !------- Task 9: Search Song By Lyrics by Ifty -------!
-def add_song_to_index(song_data, inverted_index):
-    title = song_data.get("title", "")
-    lyrics = song_data.get("lyrics", "")
-    
-    if lyrics and title:
-        words = process_text_for_analysis(lyrics)
-        
-        for word in words:
-            if word not in inverted_index:
-                inverted_index[word] = []
-            if title not in inverted_index[word]:
-                inverted_index[word].append(title)
+FUZZY_MAX_DISTANCE = 2
+FUZZY_SHORT_WORD_LENGTH = 5
+FUZZY_MAX_EXPANSIONS = 5
+FUZZY_MIN_MATCHES = 1
+TRIGRAM_CACHE = {}
+INDEX_WORKERS = os.cpu_count() or 1
+INDEX_MEMORY_BUDGET = 64 * 1024 * 1024
+INDEX_SHARD_SIZE = 256
+INDEX_MERGE_FAN_IN = 64
+POSTING_SIZE_ESTIMATE = 100
+
+def index_song_shard(task):
+    shard_start, files, run_dir, memory_budget = task
+    runs = []
+    postings = []
+    used_memory = 0
+
+    for offset, file in enumerate(files):
+        song_data = load_json(os.path.join(SONGS_DIR, file))
+        title = song_data.get("title", "") if song_data else ""
+        lyrics = song_data.get("lyrics", "") if song_data else ""
+
+        if lyrics and title:
+            for word in dict.fromkeys(process_text_for_analysis(lyrics)):
+                postings.append((word, shard_start + offset, title))
+                used_memory += len(word) + len(title) + POSTING_SIZE_ESTIMATE
+
+        if used_memory >= memory_budget:
+            runs.append(write_index_run(postings, run_dir, shard_start, len(runs)))
+            postings = []
+            used_memory = 0
+
+    if postings:
+        runs.append(write_index_run(postings, run_dir, shard_start, len(runs)))
+    return runs
+
+def write_index_run(postings, run_dir, shard_start, run_number):
+    postings.sort()
+    run_path = os.path.join(run_dir, f"run-{shard_start}-{run_number}.jsonl")
+
+    with open(run_path, "w", encoding="utf-8") as file:
+        for posting in postings:
+            file.write(json.dumps(posting) + "\n")
+    return run_path
+
+def read_index_run(file):
+    for line in file:
+        yield tuple(json.loads(line))
+
+def open_index_runs(runs, stack):
+    return [read_index_run(stack.enter_context(open(run_path, "r", encoding="utf-8"))) for run_path in runs]
+
+def reduce_index_runs(runs, run_dir):
+    pass_number = 0
+
+    # Merges at most INDEX_MERGE_FAN_IN runs at a time so the number of open files stays bounded.
+    while len(runs) > INDEX_MERGE_FAN_IN:
+        merged_runs = []
+        for start in range(0, len(runs), INDEX_MERGE_FAN_IN):
+            group = runs[start:start + INDEX_MERGE_FAN_IN]
+            merged_path = os.path.join(run_dir, f"merge-{pass_number}-{start}.jsonl")
+
+            with ExitStack() as stack:
+                streams = open_index_runs(group, stack)
+                with open(merged_path, "w", encoding="utf-8") as file:
+                    for posting in heapq.merge(*streams):
+                        file.write(json.dumps(posting) + "\n")
+
+            for run_path in group:
+                os.remove(run_path)
+            merged_runs.append(merged_path)
+
+        runs = merged_runs
+        pass_number += 1
+    return runs
+
+def merge_index_runs(runs, output_path):
+    current_word = None
+    seen_titles = set()
 
-def build_inverted_index():
-    inverted_index = {}
-    
-    files = read_all_songs()
-    
-    for file in files:
-        if file.endswith(JSON_EXTENTION):
-            song_path = os.path.join(SONGS_DIR, file)
-            song_data = load_json(song_path)
-            if song_data:
-                add_song_to_index(song_data, inverted_index)
-    
-    return inverted_index
+    # Runs are sorted by (word, file position), so titles keep the order of the song files.
+    # Titles are written as they come out of the merge; only the set of distinct titles already
+    # written for the current word is kept, to skip songs that share a title.
+    with ExitStack() as stack, atomic_write(output_path) as file:
+        streams = open_index_runs(runs, stack)
+        file.write("{")
+        for word, _, title in heapq.merge(*streams):
+            if word != current_word:
+                separator = "\n" if current_word is None else "\n  ],\n"
+                file.write(f"{separator}  {json.dumps(word)}: [\n    {json.dumps(title)}")
+                current_word = word
+                seen_titles = {title}
+            elif title not in seen_titles:
+                seen_titles.add(title)
+                file.write(f",\n    {json.dumps(title)}")
+
+        file.write("}" if current_word is None else "\n  ]\n}")
+
+def build_inverted_index(output_path, workers=INDEX_WORKERS, memory_budget=INDEX_MEMORY_BUDGET):
+    files = [file for file in read_all_songs() if file.endswith(JSON_EXTENTION)]
+    worker_budget = max(1, memory_budget // max(1, workers))
+
+    try:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=os.path.dirname(output_path)) as run_dir:
+            tasks = [(start, files[start:start + INDEX_SHARD_SIZE], run_dir, worker_budget)
+                     for start in range(0, len(files), INDEX_SHARD_SIZE)]
+
+            if workers > 1 and len(tasks) > 1:
+                with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+                    shard_runs = pool.map(index_song_shard, tasks)
+            else:
+                shard_runs = [index_song_shard(task) for task in tasks]
+
+            runs = [run_path for shard in shard_runs for run_path in shard]
+            merge_index_runs(reduce_index_runs(runs, run_dir), output_path)
+        return True
+    except IOError as error:
+        print(f"Warning: Could not build inverted index: {error}")
+        return False
 
 def load_or_create_inverted_index():
     if os.path.exists(INVERTED_INDEX_FILE):
@@ -729,16 +939,26 @@ def load_or_create_inverted_index():
         if inverted_index:
             return inverted_index
     
-    inverted_index = build_inverted_index()
+    # Only one process builds a missing index; the others wait for it and load the result.
+    with file_lock(INVERTED_INDEX_FILE):
+        if os.path.exists(INVERTED_INDEX_FILE):
+            inverted_index = load_json(INVERTED_INDEX_FILE)
+            if inverted_index:
+                return inverted_index
+
+        if build_inverted_index(INVERTED_INDEX_FILE):
+            inverted_index = load_json(INVERTED_INDEX_FILE)
+            if inverted_index is not None:
+                return inverted_index
     
+    return {}
+
+def save_inverted_index(inverted_index):
     try:
-        os.makedirs(os.path.dirname(INVERTED_INDEX_FILE), exist_ok=True)
-        with open(INVERTED_INDEX_FILE, "w", encoding="utf-8") as file:
-            json.dump(inverted_index, file, indent=2)
+        with file_lock(INVERTED_INDEX_FILE), atomic_write(INVERTED_INDEX_FILE) as file:
+            json.dump(inverted_index, file, indent=2, sort_keys=True)
     except IOError as error:
         print(f"Warning: Could not save inverted index: {error}")
-    
-    return inverted_index
 
 def calculate_song_scores(query_words, inverted_index):
     song_scores = {}
@@ -749,6 +969,92 @@ def calculate_song_scores(query_words, inverted_index):
                 song_scores[song] = song_scores.get(song, 0) + 1
     return song_scores
 
+def get_trigrams(word):
+    padded = f"  {word} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+def build_trigram_index(vocabulary):
+    trigram_index = {}
+
+    for word in vocabulary:
+        for trigram in get_trigrams(word):
+            trigram_index.setdefault(trigram, []).append(word)
+    return trigram_index
+
+def get_trigram_index(inverted_index):
+    try:
+        index_mtime = os.stat(INVERTED_INDEX_FILE).st_mtime_ns
+    except OSError:
+        index_mtime = None
+    signature = (index_mtime, len(inverted_index))
+
+    if TRIGRAM_CACHE.get("signature") != signature:
+        TRIGRAM_CACHE["trigram_index"] = build_trigram_index(inverted_index)
+        TRIGRAM_CACHE["signature"] = signature
+    return TRIGRAM_CACHE["trigram_index"]
+
+def edit_distance(first, second, max_distance):
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    # Optimal string alignment: swapping two neighbouring letters ("lvoe" for "love") counts as one edit.
+    before_previous = None
+    previous = list(range(len(second) + 1))
+    for row, first_char in enumerate(first, 1):
+        current = [row]
+        for column, second_char in enumerate(second, 1):
+            cost = 0 if first_char == second_char else 1
+            distance = min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + cost)
+            if (row > 1 and column > 1 and first_char == second[column - 2]
+                    and first[row - 2] == second_char):
+                distance = min(distance, before_previous[column - 2] + 1)
+            current.append(distance)
+        if min(current) > max_distance and min(previous) > max_distance:
+            return max_distance + 1
+        before_previous = previous
+        previous = current
+    return previous[-1]
+
+def get_max_distance(word):
+    if len(word) <= FUZZY_SHORT_WORD_LENGTH:
+        return min(1, FUZZY_MAX_DISTANCE)
+    return FUZZY_MAX_DISTANCE
+
+def expand_query_word(word, inverted_index, trigram_index):
+    max_distance = get_max_distance(word)
+    query_trigrams = get_trigrams(word)
+    shared_counts = {}
+
+    for trigram in query_trigrams:
+        for candidate in trigram_index.get(trigram, []):
+            shared_counts[candidate] = shared_counts.get(candidate, 0) + 1
+
+    # Every edit changes at most 4 trigrams, so candidates sharing fewer cannot be close enough.
+    min_shared = max(1, len(query_trigrams) - 4 * max_distance)
+    matches = []
+    for candidate, shared in shared_counts.items():
+        if shared >= min_shared and candidate != word:
+            distance = edit_distance(word, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, -len(inverted_index[candidate]), candidate))
+
+    # Only the closest words are kept; among those, the ones used in more songs are the likelier intended word.
+    matches.sort()
+    closest = [match for match in matches if match[0] == matches[0][0]] if matches else []
+    return [candidate for _, _, candidate in closest[:FUZZY_MAX_EXPANSIONS]]
+
+def add_fuzzy_song_scores(query_words, inverted_index, song_scores):
+    trigram_index = get_trigram_index(inverted_index)
+
+    for word in query_words:
+        if word not in inverted_index:
+            matched_songs = set()
+            for candidate in expand_query_word(word, inverted_index, trigram_index):
+                matched_songs.update(inverted_index[candidate])
+            for song in matched_songs:
+                song_scores[song] = song_scores.get(song, 0) + 1
+    return song_scores
+
 def search_by_lyrics():
     query = input("Please type the lyrics you'd like to search for: ").strip()
     
@@ -758,13 +1064,19 @@ def search_by_lyrics():
         if query_words:
             inverted_index = load_or_create_inverted_index()
             song_scores = calculate_song_scores(query_words, inverted_index)
+            if len(song_scores) < FUZZY_MIN_MATCHES:
+                song_scores = add_fuzzy_song_scores(query_words, inverted_index, song_scores)
             
             if song_scores:
                 sorted_songs = sorted(song_scores.items(), reverse=True)
+                page, next_cursor = get_page("search", enumerate_after, sorted_songs)
                 
-                print(f"Listing matches for '{query}'...")
-                for song, score in sorted_songs:
-                    print(f"- {song} with a score of {score}")
+                if page:
+                    print(f"Listing matches for '{query}'...")
+                    write_lines(f"- {song} with a score of {score}" for _, (song, score) in page)
+                    print_next_cursor(next_cursor)
+                else:
+                    print_listing_end("search")
             else:
                 print(f"No matches found for '{query}'.")
         else:
@@ -772,5 +1084,423 @@ def search_by_lyrics():
     else:
         print("Please enter a valid search query.")
 
+# !------- Watch Mode: Keep Derived Files Up To Date by Ifty -------!
+WATCH_INTERVAL = 1.0
+WATCH_DEBOUNCE = 2.0
+WATCH_MAX_DELAY = 30.0
+WATCHED_DIRS = [SONGS_DIR, ALBUMS_DIR, TOP_TRACKS_DIR, ARTISTS_DIR]
+
+def take_snapshot(directory):
+    snapshot = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(JSON_EXTENTION) and entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return snapshot
+
+def take_dataset_snapshot():
+    return {directory: take_snapshot(directory) for directory in WATCHED_DIRS}
+
+def diff_snapshots(old_snapshot, new_snapshot):
+    added = [name for name in new_snapshot if name not in old_snapshot]
+    changed = [name for name in new_snapshot if name in old_snapshot and new_snapshot[name] != old_snapshot[name]]
+    removed = [name for name in old_snapshot if name not in new_snapshot]
+    return added, changed, removed
+
+def read_song_entry(song_data):
+    title = song_data.get("title", "")
+    lyrics = song_data.get("lyrics", "")
+
+    if title and lyrics:
+        words = list(dict.fromkeys(process_text_for_analysis(lyrics)))
+    else:
+        words = []
+    return {"title": title, "words": words}
+
+def add_entry_to_index(entry, inverted_index):
+    title = entry["title"]
+    for word in entry["words"]:
+        postings = inverted_index.setdefault(word, [])
+        if title not in postings:
+            postings.append(title)
+
+def remove_entry_from_index(entry, state):
+    title = entry["title"]
+    inverted_index = state["inverted_index"]
+    other_entries = [state["songs"][file] for file in state["titles"].get(title, set())]
+
+    for word in entry["words"]:
+        still_used = any(word in other["words"] for other in other_entries)
+        postings = inverted_index.get(word)
+        if postings and not still_used and title in postings:
+            postings.remove(title)
+            if not postings:
+                del inverted_index[word]
+
+def track_song(state, file, entry):
+    state["songs"][file] = entry
+    state["titles"].setdefault(entry["title"], set()).add(file)
+
+def untrack_song(state, file):
+    entry = state["songs"].pop(file, None)
+    if entry:
+        files = state["titles"].get(entry["title"], set())
+        files.discard(file)
+        if not files:
+            state["titles"].pop(entry["title"], None)
+    return entry
+
+def get_moosified_path(title):
+    return os.path.join(MOOSIFIED_DIR, f"{title} Moosified.txt")
+
+def remove_moosified_output(title):
+    path = get_moosified_path(title)
+    if os.path.exists(path):
+        os.remove(path)
+        print(f"Removed moosified output for {title}.")
+
+def refresh_moosified_output(old_entry, song_data, state):
+    old_title = old_entry["title"] if old_entry else ""
+    new_title = song_data.get("title", "") if song_data else ""
+    had_output = any(title and os.path.exists(get_moosified_path(title)) for title in (old_title, new_title))
+
+    if old_title and old_title != new_title and old_title not in state["titles"]:
+        remove_moosified_output(old_title)
+
+    if had_output and new_title:
+        lyrics = song_data.get("lyrics", "")
+        if lyrics and can_be_moosified(lyrics):
+            save_moosified_lyrics(new_title, moosify_text(lyrics))
+            print(f"Updated moosified output for {new_title}.")
+        else:
+            remove_moosified_output(new_title)
+
+def apply_song_change(state, file):
+    path = os.path.join(SONGS_DIR, file)
+    song_data = None
+
+    # An unreadable file is usually still being written; keep the old state and retry on its next change.
+    if os.path.exists(path):
+        song_data = load_json(path)
+        if not song_data:
+            return False
+
+    old_entry = untrack_song(state, file)
+    if old_entry:
+        remove_entry_from_index(old_entry, state)
+
+    if song_data:
+        entry = read_song_entry(song_data)
+        track_song(state, file, entry)
+        add_entry_to_index(entry, state["inverted_index"])
+
+    refresh_moosified_output(old_entry, song_data, state)
+    return True
+
+def apply_artist_change(state, file, changed_ids):
+    path = os.path.join(ARTISTS_DIR, file)
+    artist_data = None
+
+    if os.path.exists(path):
+        artist_data = load_json(path)
+        if not artist_data:
+            return
+
+    old_id = state["artists"].pop(file, None)
+    if old_id:
+        changed_ids.add(old_id)
+
+    if artist_data and artist_data.get("id"):
+        state["artists"][file] = artist_data["id"]
+        changed_ids.add(artist_data["id"])
+
+def refresh_artist_rows(state, changed_ids):
+    artist_files = {artist_id: file for file, artist_id in state["artists"].items()}
+
+    with file_lock(ARTISTS_DATA_CSV):
+        rows = read_artists_data_csv()
+        exported_ids = {row.get("artist_id", "").strip() for row in rows}
+        affected_ids = changed_ids & exported_ids
+
+        for artist_id in affected_ids:
+            artist_file = artist_files.get(artist_id)
+
+            if artist_file:
+                artist_data = load_json(os.path.join(ARTISTS_DIR, artist_file))
+                if artist_data:
+                    update_or_append_row(rows, artist_id, create_artist_row(artist_data, artist_id))
+            else:
+                rows = [row for row in rows if row.get("artist_id", "").strip() != artist_id]
+
+        if affected_ids:
+            write_artists_data_csv(rows)
+
+    if affected_ids:
+        print(f"Updated {len(affected_ids)} row(s) in artist-data.csv.")
+
+def is_inverted_index_stale():
+    try:
+        index_mtime = os.stat(INVERTED_INDEX_FILE).st_mtime_ns
+        songs_dir_mtime = os.stat(SONGS_DIR).st_mtime_ns
+    except OSError:
+        return True
+
+    # Adding or removing a song touches the folder itself, editing one touches the file.
+    return songs_dir_mtime > index_mtime or any(
+        mtime > index_mtime for mtime, _ in take_snapshot(SONGS_DIR).values())
+
+def read_song_shard(files):
+    entries = []
+
+    for file in files:
+        song_data = load_json(os.path.join(SONGS_DIR, file))
+        if song_data:
+            entries.append((file, read_song_entry(song_data)))
+    return entries
+
+def create_watch_state():
+    state = {"inverted_index": {}, "songs": {}, "titles": {}, "artists": {}}
+
+    if is_inverted_index_stale():
+        with file_lock(INVERTED_INDEX_FILE):
+            build_inverted_index(INVERTED_INDEX_FILE)
+    state["inverted_index"] = load_or_create_inverted_index()
+
+    # The song entries remember which words each file added, so a later change or removal can be undone.
+    files = [file for file in read_all_songs() if file.endswith(JSON_EXTENTION)]
+    shards = [files[start:start + INDEX_SHARD_SIZE] for start in range(0, len(files), INDEX_SHARD_SIZE)]
+    if INDEX_WORKERS > 1 and len(shards) > 1:
+        with multiprocessing.Pool(min(INDEX_WORKERS, len(shards))) as pool:
+            shard_entries = pool.map(read_song_shard, shards)
+    else:
+        shard_entries = [read_song_shard(shard) for shard in shards]
+
+    for entries in shard_entries:
+        for file, entry in entries:
+            track_song(state, file, entry)
+
+    for file in take_snapshot(ARTISTS_DIR):
+        artist_data = load_json(os.path.join(ARTISTS_DIR, file))
+        if artist_data and artist_data.get("id"):
+            state["artists"][file] = artist_data["id"]
+
+    return state
+
+def apply_dataset_changes(state, pending):
+    changed_ids = set()
+
+    updated_songs = [file for file in sorted(pending.get(SONGS_DIR, set())) if apply_song_change(state, file)]
+    for file in sorted(pending.get(ARTISTS_DIR, set())):
+        apply_artist_change(state, file, changed_ids)
+    for directory in (ALBUMS_DIR, TOP_TRACKS_DIR):
+        for file in pending.get(directory, set()):
+            changed_ids.add(file[:-len(JSON_EXTENTION)])
+
+    if updated_songs:
+        save_inverted_index(state["inverted_index"])
+        print(f"Updated inverted index for {len(updated_songs)} song file(s).")
+    if changed_ids:
+        refresh_artist_rows(state, changed_ids)
+
+def watch_dataset():
+    print("Building initial state...")
+    snapshot = take_dataset_snapshot()
+    state = create_watch_state()
+    pending = {}
+    first_change = 0.0
+    last_change = 0.0
+
+    print("Watching dataset for changes. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            new_snapshot = take_dataset_snapshot()
+
+            for directory in WATCHED_DIRS:
+                added, changed, removed = diff_snapshots(snapshot[directory], new_snapshot[directory])
+                if added or changed or removed:
+                    if not pending:
+                        first_change = time.monotonic()
+                    pending.setdefault(directory, set()).update(added + changed + removed)
+                    last_change = time.monotonic()
+            snapshot = new_snapshot
+
+            # A steady stream of new files never settles, so pending changes are also flushed after WATCH_MAX_DELAY.
+            now = time.monotonic()
+            if pending and (now - last_change >= WATCH_DEBOUNCE or now - first_change >= WATCH_MAX_DELAY):
+                apply_dataset_changes(state, pending)
+                pending = {}
+    except KeyboardInterrupt:
+        print("Stopped watching the dataset.")
+
+# !------- Genre Analytics by Ifty -------!
+GENRE_TOP_ARTISTS = 3
+GENRE_REPORT_VERSION = 2
+ANALYTICS_DIRS = [ARTISTS_DIR, ALBUMS_DIR, TOP_TRACKS_DIR]
+
+def load_catalog_columns():
+    columns = {
+        "artist_names": [],
+        "followers": array("q"),
+        "genre_artists": {},
+        "track_artists": array("i"),
+        "track_popularity": array("i"),
+        "album_artists": array("i"),
+        "album_years": array("i"),
+    }
+    artist_ids = []
+
+    for file in list_json_files_after(ARTISTS_DIR):
+        artist_data = load_json(os.path.join(ARTISTS_DIR, file))
+        if artist_data and artist_data.get("id"):
+            position = len(artist_ids)
+            artist_ids.append(artist_data["id"])
+            columns["artist_names"].append(artist_data.get("name", ""))
+            columns["followers"].append(int((artist_data.get("followers") or {}).get("total") or 0))
+            for genre in dict.fromkeys(artist_data.get("genres", [])):
+                columns["genre_artists"].setdefault(genre, array("i")).append(position)
+
+    for position, artist_id in enumerate(artist_ids):
+        top_file = os.path.join(TOP_TRACKS_DIR, f"{artist_id}.json")
+        top_data = load_json(top_file) if os.path.exists(top_file) else None
+        for track in (top_data or {}).get("tracks", []):
+            columns["track_artists"].append(position)
+            columns["track_popularity"].append(int(track.get("popularity") or 0))
+
+        album_file = os.path.join(ALBUMS_DIR, f"{artist_id}.json")
+        albums_data = load_json(album_file) if os.path.exists(album_file) else None
+        for album in (albums_data or {}).get("items", []):
+            year = album.get("release_date", "")[:4]
+            if year.isdigit():
+                columns["album_artists"].append(position)
+                columns["album_years"].append(int(year))
+
+    return columns
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[rank - 1]
+
+def compute_genre_report(columns):
+    names = columns["artist_names"]
+    followers = columns["followers"]
+    artist_popularity = [array("i") for _ in names]
+    artist_album_years = [{} for _ in names]
+
+    # One pass over each column groups the values per artist; genres then combine their artists.
+    for position, popularity in zip(columns["track_artists"], columns["track_popularity"]):
+        artist_popularity[position].append(popularity)
+    for position, year in zip(columns["album_artists"], columns["album_years"]):
+        artist_album_years[position][year] = artist_album_years[position].get(year, 0) + 1
+
+    report = {}
+    for genre, positions in sorted(columns["genre_artists"].items()):
+        popularity = sorted(value for position in positions for value in artist_popularity[position])
+        albums_by_year = {}
+        for position in positions:
+            for year, count in artist_album_years[position].items():
+                albums_by_year[year] = albums_by_year.get(year, 0) + count
+        top_artists = sorted(positions, key=lambda position: (-followers[position], names[position]))
+
+        report[genre] = {
+            "artists": len(positions),
+            "followers_total": sum(followers[position] for position in positions),
+            "popularity_average": round(sum(popularity) / len(popularity), 1) if popularity else 0,
+            "popularity_median": percentile(popularity, 50),
+            "popularity_p90": percentile(popularity, 90),
+            "albums_by_year": {str(year): albums_by_year[year] for year in sorted(albums_by_year)},
+            "top_artists": [names[position] for position in top_artists[:GENRE_TOP_ARTISTS]],
+        }
+    return report
+
+def get_catalog_signature():
+    return {
+        os.path.basename(directory): {file: list(stat) for file, stat in sorted(take_snapshot(directory).items())}
+        for directory in ANALYTICS_DIRS
+    }
+
+def load_or_create_genre_report():
+    signature = get_catalog_signature()
+
+    if os.path.exists(GENRE_ANALYTICS_FILE):
+        cached = load_json(GENRE_ANALYTICS_FILE)
+        if cached and cached.get("version") == GENRE_REPORT_VERSION and cached.get("signature") == signature:
+            return cached.get("report", {})
+
+    report = compute_genre_report(load_catalog_columns())
+    try:
+        with file_lock(GENRE_ANALYTICS_FILE), atomic_write(GENRE_ANALYTICS_FILE) as file:
+            json.dump({"version": GENRE_REPORT_VERSION, "signature": signature, "report": report}, file, indent=2)
+    except IOError as error:
+        print(f"Warning: Could not save genre analytics: {error}")
+
+    return report
+
+def format_genre_line(genre, stats):
+    albums = ", ".join(f"{year}: {count}" for year, count in stats["albums_by_year"].items()) or "none"
+    artist_word = "artist" if stats["artists"] == 1 else "artists"
+    return (f"- {genre}: {stats['artists']} {artist_word}, {stats['followers_total']:,} followers. "
+            f"Track popularity average {stats['popularity_average']}, median {stats['popularity_median']}, "
+            f"90th percentile {stats['popularity_p90']}. "
+            f"Top artists: {', '.join(stats['top_artists'])}. Albums by year: {albums}.")
+
+def print_genre_report():
+    report = load_or_create_genre_report()
+
+    if report:
+        page, next_cursor = get_page("genres", enumerate_after, list(report.items()))
+
+        if page:
+            genre_word = "genre" if len(report) == 1 else "genres"
+            print(f"Genre analytics for {len(report)} {genre_word}:")
+            write_lines(format_genre_line(genre, stats) for _, (genre, stats) in page)
+            print_next_cursor(next_cursor)
+        else:
+            print_listing_end("genres")
+    else:
+        print("No genres found in the database.")
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(prog="mooziq", description="Mooziq music analysis and discovery platform.")
+    parser.add_argument("command", nargs="?", choices=["watch", "build-index", "genre-report"],
+                        help="run a maintenance command instead of the main menu")
+    parser.add_argument("--page-size", type=int, default=0,
+                        help="maximum number of entries shown per listing (0 shows everything)")
+    parser.add_argument("--after", help="cursor printed by the previous page of a listing, e.g. artists:<file> or search:<position>")
+    parser.add_argument("--workers", type=int, default=INDEX_WORKERS,
+                        help="number of worker processes used by build-index")
+    parser.add_argument("--memory-budget", type=int, default=INDEX_MEMORY_BUDGET // (1024 * 1024),
+                        help="memory budget in MB shared by the build-index workers")
+    arguments = parser.parse_args()
+
+    if arguments.page_size < 0:
+        parser.error("--page-size must be 0 or a positive number")
+    if arguments.workers < 1:
+        parser.error("--workers must be a positive number")
+    if arguments.memory_budget < 1:
+        parser.error("--memory-budget must be a positive number")
+    return arguments
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    arguments = parse_arguments()
+    LISTING_OPTIONS["page_size"] = arguments.page_size
+    LISTING_OPTIONS["after"] = arguments.after
+
+    if arguments.command == "watch":
+        watch_dataset()
+    elif arguments.command == "genre-report":
+        print_genre_report()
+    elif arguments.command == "build-index":
+        with file_lock(INVERTED_INDEX_FILE):
+            is_built = build_inverted_index(INVERTED_INDEX_FILE, arguments.workers,
+                                            arguments.memory_budget * 1024 * 1024)
+        if is_built:
+            print(f"Inverted index saved at {INVERTED_INDEX_FILE}")
+    else:
+        main()
\ No newline at end of file